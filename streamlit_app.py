@@ -1,14 +1,19 @@
+import datetime
+import hashlib
+import html
+import io
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
 import streamlit as st
-from utils import (
-    parse_cv,
-    parse_linkedin,
-    analyze_ats,
-    generate_optimized_cv,
-    generate_portfolio,
-    generate_skills_roadmap,
-    parse_pdf,
-    parse_txt,
-)
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # ─────────────────────────────────────────────
 # PAGE CONFIG
@@ -26,7 +31,15 @@ st.set_page_config(
 # ─────────────────────────────────────────────
 # GLOBAL CSS
 # ─────────────────────────────────────────────
-st.markdown("""
+# Streamlit drops any element a rerun doesn't re-emit, so the stylesheet has to
+# be sent on every run; strip comments and whitespace once at import to keep
+# that payload small.
+def _minify_css(css: str) -> str:
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    return re.sub(r'\s+', ' ', css).strip()
+
+
+_CSS = _minify_css("""
 <style>
   /* hide default streamlit chrome */
   #MainMenu, footer, .reportview-container .main .block-container > div:first-child { display:none !important; }
@@ -79,6 +92,14 @@ st.markdown("""
   }
   .tip-card strong { color:#fff; }
 
+  /* ── experience entry ── */
+  .exp-entry {
+      background:#161923; border:1px solid #2a2d38;
+      border-radius:8px; padding:.6rem 1rem; margin:.4rem 0;
+  }
+  .exp-entry summary { cursor:pointer; color:#e2e4e9; }
+  .exp-entry p { margin:.5rem 0 0; font-size:.88rem; color:#c8cad0; white-space:pre-line; }
+
   /* ── download strip ── */
   .dl-strip {
       background:#1a1d27; border:1px solid #2a2d38;
@@ -90,36 +111,527 @@ st.markdown("""
   .dl-strip .dl-text { font-size:.82rem; color:#7a7f8e; }
   .dl-strip .dl-text strong { color:#e2e4e9; font-size:.9rem; }
 </style>
-""", unsafe_allow_html=True)
+""")
+
+_PILL_MATCHED = '<span class="pill pill-green">%s</span>'
+_PILL_MISSING = '<span class="pill pill-red">%s</span>'
+
+_ARTIFACT_LABELS = {
+    'ats_results': "ATS analysis done",
+    'cv_pdf': "Optimized CV generated",
+    'portfolio_zip': "Portfolio built",
+}
+
+# skills shown in the Parsed Data grid before the "show all" expander
+_SKILLS_PREVIEW = 20
+
+_WELCOME_CARD = (
+    '<div style="background:#1a1d27;border:1px solid #2a2d38;border-radius:12px;padding:1.6rem 1.2rem;height:100%;">'
+    '<div style="font-size:2rem;margin-bottom:.5rem;">{icon}</div>'
+    '<h4 style="color:#fff;margin-bottom:.4rem;">{title}</h4>'
+    '<p style="color:#7a7f8e;font-size:.82rem;line-height:1.5;">{desc}</p>'
+    '</div>'
+)
+
+_WELCOME_FEATURES = [
+    ("ATS Scoring", "📊", "Keyword-match score vs any job description. Pinpoint exactly what's missing."),
+    ("CV Generation", "📄", "Download a clean, ATS-friendly PDF tailored to the role."),
+    ("Portfolio Site", "🌐", "A responsive, deployable HTML portfolio — no coding needed."),
+]
+
+_WELCOME_HTML = (
+    '<div style="display:grid;grid-template-columns:repeat(3,1fr);gap:1rem;">'
+    + "".join(_WELCOME_CARD.format(icon=icon, title=title, desc=desc) for title, icon, desc in _WELCOME_FEATURES)
+    + '</div>'
+)
 
 
 # ─────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────
+# `utils` (and, through it, requests and whichever parser/renderer a call needs)
+# is imported inside the helpers below — the welcome screen renders without it.
+
+_MAX_JOB_PAGE_BYTES = 512 * 1024
+# ATS matching scales with job text length; nothing useful lives past this
+_MAX_JOB_CHARS = 20_000
+# page chrome and non-text elements dropped before extracting job text
+_STRIP_TAGS = ('script', 'style', 'noscript', 'svg', 'iframe', 'nav', 'header', 'footer')
+_STRIP_XPATH = '|'.join(f'//{tag}' for tag in _STRIP_TAGS) + '|//comment()'
+
 
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
 def _fetch_job_from_url(url: str) -> str:
     """Try to pull job description text from a URL."""
-    import requests
-    from bs4 import BeautifulSoup
+    import lxml.html
+    from utils import HTTP_SESSION
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'}
-        resp = requests.get(url, headers=headers, timeout=12)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        # strip scripts/styles
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer']):
-            tag.decompose()
-        text = soup.get_text(separator='\n', strip=True)
-        # return a reasonable chunk
-        return '\n'.join(text.split('\n')[:200])
+        # stream the body and stop at the cap — job boards often inline MBs of JS
+        with HTTP_SESSION.get(url, timeout=12, stream=True) as resp:
+            resp.raise_for_status()
+            body = bytearray()
+            for chunk in resp.iter_content(chunk_size=65536):
+                body += chunk
+                if len(body) >= _MAX_JOB_PAGE_BYTES:
+                    break
+            # only trust an explicit charset; otherwise let lxml sniff <meta charset>
+            declared = 'charset' in resp.headers.get('Content-Type', '').lower()
+            parser = lxml.html.HTMLParser(encoding=resp.encoding) if declared else None
+        # lxml rejects an empty document outright; treat it as "no readable text"
+        if not body.strip():
+            return ''
+        # lxml builds the tree in C — far cheaper than BeautifulSoup's html.parser
+        tree = lxml.html.fromstring(bytes(body), parser=parser)
+        # strip scripts/styles/chrome
+        for el in tree.xpath(_STRIP_XPATH):
+            el.drop_tree()
+        # the byte cap bounds this; _run_pipeline trims to _MAX_JOB_CHARS and says so
+        return '\n'.join(t.strip() for t in tree.itertext() if t.strip())
     except Exception as e:
         raise Exception(f"Could not fetch URL: {e}")
 
 
+def _in_script_ctx(fn):
+    """Wrap `fn` so it runs with the current script-run context in a worker thread."""
+    ctx = get_script_run_ctx()
+
+    def run(*args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    return run
+
+
+@st.cache_data(show_spinner=False)
+def _cached_parse_cv(file_bytes: bytes, name: str) -> dict:
+    """Parse an uploaded CV once per distinct file; reruns hit the cache."""
+    from utils import parse_cv
+    return parse_cv(io.BytesIO(file_bytes), name)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_parse_linkedin(url: str) -> dict:
+    from utils import parse_linkedin
+    return parse_linkedin(url)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_parse_job_pdf(file_bytes: bytes) -> str:
+    from utils import parse_pdf
+    return parse_pdf(file_bytes)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_parse_job_txt(file_bytes: bytes) -> str:
+    from utils import parse_txt
+    return parse_txt(file_bytes)
+
+
+def _data_key(cv_data: dict) -> str:
+    """Stable content hash of the parsed CV data, used to key cached artifacts."""
+    raw = json.dumps(cv_data, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _artifacts_key(data_key: str, job_text: Optional[str], today: str) -> str:
+    job_hash = hashlib.blake2b((job_text or '').encode(), digest_size=8).hexdigest()
+    return f"{data_key}:{job_hash}:{today}"
+
+
+@st.cache_resource(show_spinner=False)
+def _process_pool() -> ProcessPoolExecutor:
+    """Worker processes for the CPU-bound generators, kept alive across reruns.
+
+    ReportLab layout is pure Python and holds the GIL, so the CV and portfolio
+    only truly overlap in separate processes. "spawn" avoids forking the
+    multi-threaded Streamlit server.
+    """
+    return ProcessPoolExecutor(
+        max_workers=min(os.cpu_count() or 2, 4),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _run_in_pool(fn, *args):
+    """Run `fn` in the process pool, rebuilding the pool once if a worker died."""
+    pool = _process_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        # a killed worker breaks the executor for good; release it and drop it
+        # from the cache (unless a concurrent caller already replaced it)
+        pool.shutdown(wait=False, cancel_futures=True)
+        if _process_pool() is pool:
+            _process_pool.clear()
+        return _process_pool().submit(fn, *args).result()
+
+
+# `_cv_data` is excluded from Streamlit's hashing; `data_key` stands in for it.
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_cv_pdf(data_key: str, _cv_data: dict, job_text: Optional[str]) -> bytes:
+    from utils import generate_optimized_cv
+    return _run_in_pool(generate_optimized_cv, _cv_data, job_text)
+
+
+# the portfolio footer/README and the roadmap header carry the current date, so
+# `today` is part of their cache keys; a new day rebuilds them
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_portfolio(data_key: str, _cv_data: dict, today: str) -> bytes:
+    from utils import generate_portfolio
+    return _run_in_pool(generate_portfolio, _cv_data)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_ats(data_key: str, _cv_data: dict, job_text: str) -> dict:
+    from utils import analyze_ats
+    return analyze_ats(_cv_data, job_text)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_roadmap(missing_skills: list, today: str) -> str:
+    from utils import generate_skills_roadmap
+    return generate_skills_roadmap(missing_skills)
+
+
+def _merge_skills(primary: list, extra: list) -> list:
+    """Order-preserving union of two skill lists, ignoring blank entries.
+
+    Entries are compared case-insensitively; the first spelling wins.
+    """
+    seen, merged = set(), []
+    for s in (*primary, *extra):
+        s = (s or '').strip()
+        key = s.casefold()
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(s)
+    return merged
+
+
+# ATS results are stable across reruns, so the rendered markup is reused on tab switches
+@lru_cache(maxsize=64)
+def _pills_html(template: str, skills: tuple) -> str:
+    return " ".join(template % s.title() for s in skills)
+
+
+@lru_cache(maxsize=32)
+def _tips_html(tips: tuple) -> str:
+    return "".join(f'<div class="tip-card"><strong>{i}.</strong> {tip}</div>' for i, tip in enumerate(tips, 1))
+
+
+# (minimum score, score-ring background), highest threshold first
+_SCORE_COLORS = (
+    (75, "linear-gradient(135deg,#16a34a,#22c55e)"),
+    (50, "linear-gradient(135deg,#ca8a04,#eab308)"),
+    (0,  "linear-gradient(135deg,#dc2626,#ef4444)"),
+)
+
+
 def _score_color(score: int) -> str:
-    if score >= 75: return "linear-gradient(135deg,#16a34a,#22c55e)"
-    if score >= 50: return "linear-gradient(135deg,#ca8a04,#eab308)"
-    return "linear-gradient(135deg,#dc2626,#ef4444)"
+    return next((c for t, c in _SCORE_COLORS if score >= t), _SCORE_COLORS[-1][1])
+
+
+def _input_fingerprint(cv_bytes, linkedin_url, job_text_input, job_bytes, job_url_input) -> tuple:
+    """Identify the analysis inputs; mirrors the job-description precedence in `_run_pipeline`."""
+    cv_hash = hashlib.blake2b(cv_bytes, digest_size=16).hexdigest() if cv_bytes else None
+    if job_text_input.strip():
+        job = ('text', job_text_input.strip())
+    elif job_bytes:
+        job = ('file', hashlib.blake2b(job_bytes, digest_size=16).hexdigest())
+    else:
+        job = ('url', job_url_input.strip())
+    return cv_hash, linkedin_url, job
+
+
+def _run_pipeline(cv_file, cv_bytes, linkedin_url, job_text_input, job_file_input, job_bytes, job_url_input, progress):
+    """Parse the inputs and resolve the job description.
+
+    `progress` is an ``st.empty()`` placeholder, filled with a progress bar
+    covering the first half of the run (analysis and generation fill the rest).
+    Returns None after reporting a fatal error; otherwise a dict holding the
+    parsed data, job text and any non-fatal notices to display. `ok` is False
+    when a non-fatal fetch failed, so the result must not be reused.
+    """
+    cv_data = None
+    job_text = None
+    notices = []
+    ok = True
+
+    progress.progress(0.0, text="Parsing your documents…")
+
+    # CV, LinkedIn and job-description loading are independent — run them side by side
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        fut_cv = fut_li = fut_job = None
+        if cv_file:
+            fut_cv = ex.submit(_in_script_ctx(_cached_parse_cv), cv_bytes, cv_file.name)
+        if linkedin_url:
+            fut_li = ex.submit(_in_script_ctx(_cached_parse_linkedin), linkedin_url)
+        job_url = job_url_input.strip()
+        if not job_text_input.strip():
+            if job_file_input:
+                parse_job = _cached_parse_job_pdf if job_file_input.name.endswith('.pdf') else _cached_parse_job_txt
+                fut_job = ex.submit(_in_script_ctx(parse_job), job_bytes)
+            elif job_url:
+                fut_job = ex.submit(_in_script_ctx(_fetch_job_from_url), job_url)
+
+        labels = {fut: label for fut, label in ((fut_cv, "CV parsed"),
+                                                (fut_li, "LinkedIn profile fetched"),
+                                                (fut_job, "Job description loaded")) if fut}
+        for i, fut in enumerate(as_completed(labels), 1):
+            progress.progress(0.5 * i / len(labels), text=labels[fut])
+
+    # --- CV ---
+    if fut_cv:
+        try:
+            cv_data = fut_cv.result()
+        except Exception as e:
+            st.error(f"CV parse failed: {e}")
+            return None
+
+    # --- LinkedIn ---
+    if fut_li:
+        try:
+            li_data = fut_li.result()
+            if cv_data:
+                # merge skills
+                cv_data['skills'] = _merge_skills(cv_data['skills'], li_data.get('skills', []))
+            else:
+                cv_data = li_data
+            notices.append(('info', "LinkedIn data merged. (LinkedIn limits public scraping — CV upload gives richer results.)"))
+        except Exception as e:
+            ok = False
+            notices.append(('warning', str(e)))
+
+    if not cv_data:
+        for kind, msg in notices:
+            getattr(st, kind)(msg)
+        st.error("No usable data extracted. Please upload your CV.")
+        return None
+
+    # --- Job description ---
+    if job_text_input.strip():
+        job_text = job_text_input.strip()
+    elif job_file_input:
+        try:
+            job_text = fut_job.result()
+        except Exception as e:
+            st.error(f"Job PDF parse failed: {e}")
+            return None
+    elif job_url:
+        try:
+            job_text = fut_job.result()
+        except Exception as e:
+            st.error(str(e))
+            return None
+        if not job_text:
+            notices.append(('warning', "No readable text found at that URL — try pasting the job description instead."))
+
+    if job_text and len(job_text) > _MAX_JOB_CHARS:
+        job_text = job_text[:_MAX_JOB_CHARS]
+        notices.append(('info', f"Job description is very long — only the first {_MAX_JOB_CHARS:,} characters are analysed."))
+
+    progress.progress(0.5, text="Documents parsed")
+
+    return {
+        'cv_data': cv_data,
+        'job_text': job_text,
+        'data_key': _data_key(cv_data),
+        'notices': notices,
+        'ok': ok,
+    }
+
+
+# ─────────────────────────────────────────────
+# TABS
+# ─────────────────────────────────────────────
+# each tab renderer is a fragment: its own widgets rerun just that tab
+
+@st.fragment
+def _render_ats_tab(ats_results: dict):
+    """ATS score, matched / missing skills and improvement tips."""
+    score = ats_results['score']
+    matched = ats_results['matched_skills']
+    missing = ats_results['missing_skills']
+    tips    = ats_results['tips']
+
+    # score ring + 2 counters
+    c1, c2, c3 = st.columns([1.2, 1, 1])
+    with c1:
+        st.markdown(f"""
+        <div class="score-ring" style="background:{_score_color(score)};">
+          <div class="num">{score}%</div>
+          <div class="lbl">ATS Score</div>
+        </div>""", unsafe_allow_html=True)
+    with c2:
+        st.metric("✅ Matched", len(matched), help="Keywords found in your CV")
+    with c3:
+        st.metric("❌ Missing", len(missing), help="Keywords absent from your CV")
+
+    st.markdown("---")
+
+    # matched pills
+    if matched:
+        st.markdown("**Matched Skills**")
+        st.markdown(_pills_html(_PILL_MATCHED, tuple(matched)), unsafe_allow_html=True)
+        st.markdown("")
+
+    # missing pills
+    if missing:
+        st.markdown("**Skills to Add**")
+        st.markdown(_pills_html(_PILL_MISSING, tuple(missing)), unsafe_allow_html=True)
+        st.markdown("")
+
+    st.markdown("---")
+
+    # tips
+    st.markdown("### 💡 Improvement Tips")
+    st.markdown(_tips_html(tuple(tips)), unsafe_allow_html=True)
+
+
+@st.fragment
+def _render_cv_tab(artifacts: dict):
+    """Optimized CV download."""
+    cv_pdf = artifacts['cv_pdf']
+
+    st.markdown("""
+    <div class="dl-strip">
+      <div class="dl-icon">📄</div>
+      <div class="dl-text">
+        <strong>Optimized CV Ready</strong><br/>
+        Professional layout, keyword-rich, ATS-friendly PDF.
+      </div>
+    </div>""", unsafe_allow_html=True)
+    st.markdown("")
+    st.download_button(
+        "⬇️  Download CV (PDF)",
+        data=cv_pdf,
+        file_name="optimized_cv.pdf",
+        mime="application/pdf",
+        use_container_width=True,
+    )
+
+    st.markdown("---")
+    st.markdown("""
+    **What's included in the generated CV:**
+    - Clean two-colour header with contact info
+    - Professional Summary auto-generated from your skills
+    - Skills section (up to 16 keywords)
+    - Experience & Education pulled from your upload
+    - Consistent typography optimised for ATS parsers
+    """)
+
+
+@st.fragment
+def _render_portfolio_tab(artifacts: dict):
+    """Portfolio ZIP download and deployment notes."""
+    port_zip = artifacts['portfolio_zip']
+
+    st.markdown("""
+    <div class="dl-strip">
+      <div class="dl-icon">🌐</div>
+      <div class="dl-text">
+        <strong>Portfolio Website Ready</strong><br/>
+        Single-file HTML + CSS. Deploy anywhere for free.
+      </div>
+    </div>""", unsafe_allow_html=True)
+    st.markdown("")
+    st.download_button(
+        "⬇️  Download Portfolio (ZIP)",
+        data=port_zip,
+        file_name="portfolio.zip",
+        mime="application/zip",
+        use_container_width=True,
+    )
+
+    st.markdown("---")
+    st.markdown("""
+    **Sections included:** Hero · About · Skills Grid · Experience Timeline · Education · Contact
+
+    **Free deployment options:**
+    1. **GitHub Pages** — push `index.html` to a repo, enable Pages → live URL
+    2. **Netlify** — drag & drop the folder on netlify.app
+    3. **Vercel** — connect your GitHub repo in one click
+    4. **Cloudflare Pages** — drag & drop, instant global CDN
+    """)
+
+
+@st.fragment
+def _render_roadmap_tab(ats_results: dict, artifacts: dict):
+    """Learning roadmap for the missing skills."""
+    missing = ats_results['missing_skills']
+    if missing:
+        if 'roadmap_md' not in artifacts:
+            with st.spinner("Building roadmap…"):
+                artifacts['roadmap_md'] = _cached_roadmap(missing, datetime.date.today().isoformat())
+        roadmap_md = artifacts['roadmap_md']
+        st.markdown(roadmap_md)
+        st.markdown("---")
+        st.download_button(
+            "⬇️  Download Roadmap (Markdown)",
+            data=roadmap_md,
+            file_name="skills_roadmap.md",
+            mime="text/markdown",
+        )
+    else:
+        st.success("🎉 Your skills are a strong match — no gaps detected!")
+
+
+def _skill_columns(skills: list):
+    """Lay skills out across 5 columns, one markdown call per column."""
+    cols = st.columns(5)
+    for i, col in enumerate(cols):
+        bucket = skills[i::5]
+        if bucket:
+            col.markdown("\n\n".join(f"✓ {s}" for s in bucket))
+
+
+@st.fragment
+def _render_data_tab(cv_data: dict):
+    """Everything extracted from the uploaded documents."""
+    skills = cv_data.get('skills') or []
+    experience = cv_data.get('experience') or []
+    education = cv_data.get('education') or []
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("#### 👤 Profile")
+        st.write(f"**Name:** {cv_data.get('name','—')}")
+        st.write(f"**Email:** {cv_data.get('email','—')}")
+        st.write(f"**Phone:** {cv_data.get('phone','—')}")
+    with c2:
+        st.markdown("#### 📊 Counts")
+        st.metric("Skills", len(skills))
+        st.metric("Experience entries", len(experience))
+        st.metric("Education entries", len(education))
+
+    st.markdown("---")
+
+    # skills
+    if skills:
+        st.markdown("#### 💼 Detected Skills")
+        _skill_columns(skills[:_SKILLS_PREVIEW])
+        if len(skills) > _SKILLS_PREVIEW:
+            with st.expander(f"Show all {len(skills)} skills"):
+                _skill_columns(skills[_SKILLS_PREVIEW:])
+
+    st.markdown("---")
+
+    # experience
+    if experience:
+        st.markdown("#### 🏢 Experience")
+        # native <details> toggles client-side: one markdown for all entries, no reruns
+        st.markdown("".join(
+            f'<details class="exp-entry"><summary><strong>{html.escape(exp.get("title") or "Entry")}</strong></summary>'
+            f'<p>{html.escape(exp.get("description") or "No additional detail.")}</p></details>'
+            for exp in experience
+        ), unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # education
+    if education:
+        st.markdown("#### 🎓 Education")
+        for e in education:
+            st.write(f"• {e}")
 
 
 # ─────────────────────────────────────────────
@@ -127,6 +639,8 @@ def _score_color(score: int) -> str:
 # ─────────────────────────────────────────────
 
 def main():
+    st.markdown(_CSS, unsafe_allow_html=True)
+
     # ── Header ──
     st.markdown('<div class="cb-header"><h1>🚀 CareerBoost AI</h1>'
                 '<p>ATS optimization • CV generation • Portfolio builder • Skills roadmap</p></div>',
@@ -166,86 +680,84 @@ def main():
         st.markdown("---")
         go = st.button("🚀  Analyze & Generate", type="primary", use_container_width=True)
 
+    # results from an earlier analysis stay on screen across reruns (e.g. a
+    # radio toggle) until the user asks for a new one
+    show_results = go or st.session_state.get("artifacts_ready", False)
+
     # ─── WELCOME STATE ────────────────────────
-    if not go:
-        c1, c2, c3 = st.columns(3)
-        for col, title, icon, desc in [
-            (c1, "ATS Scoring", "📊", "Keyword-match score vs any job description. Pinpoint exactly what's missing."),
-            (c2, "CV Generation", "📄", "Download a clean, ATS-friendly PDF tailored to the role."),
-            (c3, "Portfolio Site", "🌐", "A responsive, deployable HTML portfolio — no coding needed."),
-        ]:
-            with col:
-                st.markdown(f"""
-                <div style="background:#1a1d27;border:1px solid #2a2d38;border-radius:12px;padding:1.6rem 1.2rem;height:100%;">
-                  <div style="font-size:2rem;margin-bottom:.5rem;">{icon}</div>
-                  <h4 style="color:#fff;margin-bottom:.4rem;">{title}</h4>
-                  <p style="color:#7a7f8e;font-size:.82rem;line-height:1.5;">{desc}</p>
-                </div>""", unsafe_allow_html=True)
+    if not show_results:
+        # all three cards in one grid → a single markdown element
+        st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
 
         st.markdown("<br/>", unsafe_allow_html=True)
         st.info("👈  Upload your CV (and optionally a job description) in the sidebar, then hit **Analyze & Generate**.")
         return
 
-    # ─── VALIDATION ───────────────────────────
-    if not cv_file and not linkedin_url:
-        st.error("⚠️ Please upload a CV **or** provide a LinkedIn URL.")
-        return
-
-    # ─── PROCESSING ───────────────────────────
-    cv_data = None
-    job_text = None
-
-    with st.spinner("Parsing your documents…"):
-        # --- CV ---
-        if cv_file:
-            try:
-                cv_data = parse_cv(cv_file)
-            except Exception as e:
-                st.error(f"CV parse failed: {e}")
-                return
+    # a single progress bar tracks parsing, analysis and generation
+    progress = st.empty()
 
-        # --- LinkedIn ---
-        if linkedin_url:
-            try:
-                li_data = parse_linkedin(linkedin_url)
-                if cv_data:
-                    # merge skills
-                    cv_data['skills'] = list(dict.fromkeys(cv_data['skills'] + li_data.get('skills', [])))
-                else:
-                    cv_data = li_data
-                st.info("LinkedIn data merged. (LinkedIn limits public scraping — CV upload gives richer results.)")
-            except Exception as e:
-                st.warning(str(e))
-
-        if not cv_data:
-            st.error("No usable data extracted. Please upload your CV.")
+    if go:
+        # ─── VALIDATION ───────────────────────────
+        if not cv_file and not linkedin_url:
+            st.session_state["artifacts_ready"] = False
+            st.error("⚠️ Please upload a CV **or** provide a LinkedIn URL.")
             return
 
-        # --- Job description ---
-        if job_text_input.strip():
-            job_text = job_text_input.strip()
-        elif job_file_input:
-            try:
-                if job_file_input.name.endswith('.pdf'):
-                    job_text = parse_pdf(job_file_input)
-                else:
-                    job_text = parse_txt(job_file_input)
-            except Exception as e:
-                st.error(f"Job PDF parse failed: {e}")
-                return
-        elif job_url_input.strip():
-            try:
-                job_text = _fetch_job_from_url(job_url_input.strip())
-            except Exception as e:
-                st.error(str(e))
+        # ─── PROCESSING ───────────────────────────
+        # snapshot uploads once; the same bytes feed the parsers and the cache keys
+        cv_bytes = cv_file.getvalue() if cv_file else None
+        job_bytes = job_file_input.getvalue() if job_file_input else None
+
+        # skip parsing and analysis entirely when the inputs haven't changed
+        # since the last run; a run with a failed fetch is always retried
+        fp = _input_fingerprint(cv_bytes, linkedin_url, job_text_input, job_bytes, job_url_input)
+        pipeline = st.session_state.get("pipeline")
+        if pipeline is None or pipeline['fp'] != fp or not pipeline['ok']:
+            pipeline = _run_pipeline(cv_file, cv_bytes, linkedin_url, job_text_input, job_file_input,
+                                     job_bytes, job_url_input, progress)
+            if pipeline is None:
+                progress.empty()
+                st.session_state["artifacts_ready"] = False
                 return
+            pipeline['fp'] = fp
+            st.session_state["pipeline"] = pipeline
+        st.session_state["artifacts_ready"] = True
+
+    pipeline = st.session_state["pipeline"]
+    for kind, msg in pipeline['notices']:
+        getattr(st, kind)(msg)
+
+    cv_data = pipeline['cv_data']
+    job_text = pipeline['job_text']
+    data_key = pipeline['data_key']
+
+    # generated bytes live in session_state for the current inputs and day, so reruns
+    # (e.g. a download click) reuse them instead of rebuilding
+    today = datetime.date.today().isoformat()
+    art_key = _artifacts_key(data_key, job_text, today)
+    if st.session_state.get("artifacts_key") != art_key:
+        st.session_state["artifacts_key"] = art_key
+        st.session_state["artifacts"] = {}
+    artifacts = st.session_state["artifacts"]
+
+    # ATS analysis, CV PDF and portfolio ZIP only need the parsed data — kick
+    # them all off together as soon as parsing is done and report each as it lands
+    pending = {}
+    with ThreadPoolExecutor(max_workers=3) as gen_pool:
+        if job_text and 'ats_results' not in artifacts:
+            pending[gen_pool.submit(_in_script_ctx(_cached_ats), data_key, cv_data, job_text)] = 'ats_results'
+        if 'cv_pdf' not in artifacts:
+            pending[gen_pool.submit(_in_script_ctx(_cached_cv_pdf), data_key, cv_data, job_text)] = 'cv_pdf'
+        if 'portfolio_zip' not in artifacts:
+            pending[gen_pool.submit(_in_script_ctx(_cached_portfolio), data_key, cv_data, today)] = 'portfolio_zip'
+        for i, fut in enumerate(as_completed(pending), 1):
+            name = pending[fut]
+            artifacts[name] = fut.result()
+            progress.progress(0.5 + 0.5 * i / len(pending), text=_ARTIFACT_LABELS[name])
+    progress.empty()
+    ats_results = artifacts.get('ats_results')
 
     # ─── BUILD TABS ───────────────────────────
-    ats_results = None
-    if job_text:
-        with st.spinner("Running ATS analysis…"):
-            ats_results = analyze_ats(cv_data, job_text)
-
     # determine tab set
     if ats_results:
         tabs = st.tabs(["📊 ATS Analysis", "📄 Optimized CV", "🌐 Portfolio", "📚 Roadmap", "📋 Parsed Data"])
@@ -255,180 +767,24 @@ def main():
         t_cv, t_port, t_data = tabs
         t_ats = t_road = None
 
-    # ═══════════════════════════════════════════
-    # TAB 1 — ATS ANALYSIS
-    # ═══════════════════════════════════════════
+    # each tab body is a fragment, so interacting with one (e.g. a download
+    # click) reruns only that tab instead of the whole script
     if t_ats and ats_results:
         with t_ats:
-            score = ats_results['score']
-            matched = ats_results['matched_skills']
-            missing = ats_results['missing_skills']
-            tips    = ats_results['tips']
-
-            # score ring + 2 counters
-            c1, c2, c3 = st.columns([1.2, 1, 1])
-            with c1:
-                st.markdown(f"""
-                <div class="score-ring" style="background:{_score_color(score)};">
-                  <div class="num">{score}%</div>
-                  <div class="lbl">ATS Score</div>
-                </div>""", unsafe_allow_html=True)
-            with c2:
-                st.metric("✅ Matched", len(matched), help="Keywords found in your CV")
-            with c3:
-                st.metric("❌ Missing", len(missing), help="Keywords absent from your CV")
-
-            st.markdown("---")
-
-            # matched pills
-            if matched:
-                st.markdown("**Matched Skills**")
-                st.markdown(" ".join(f'<span class="pill pill-green">{s.title()}</span>' for s in matched), unsafe_allow_html=True)
-                st.markdown("")
-
-            # missing pills
-            if missing:
-                st.markdown("**Skills to Add**")
-                st.markdown(" ".join(f'<span class="pill pill-red">{s.title()}</span>' for s in missing), unsafe_allow_html=True)
-                st.markdown("")
-
-            st.markdown("---")
-
-            # tips
-            st.markdown("### 💡 Improvement Tips")
-            for i, tip in enumerate(tips, 1):
-                st.markdown(f'<div class="tip-card"><strong>{i}.</strong> {tip}</div>', unsafe_allow_html=True)
-
-    # ═══════════════════════════════════════════
-    # TAB 2 — OPTIMIZED CV
-    # ═══════════════════════════════════════════
+            _render_ats_tab(ats_results)
+
     with t_cv:
-        with st.spinner("Generating ATS-optimized CV…"):
-            cv_pdf = generate_optimized_cv(cv_data, job_text)
-
-        st.markdown("""
-        <div class="dl-strip">
-          <div class="dl-icon">📄</div>
-          <div class="dl-text">
-            <strong>Optimized CV Ready</strong><br/>
-            Professional layout, keyword-rich, ATS-friendly PDF.
-          </div>
-        </div>""", unsafe_allow_html=True)
-        st.markdown("")
-        st.download_button(
-            "⬇️  Download CV (PDF)",
-            data=cv_pdf,
-            file_name="optimized_cv.pdf",
-            mime="application/pdf",
-            use_container_width=True,
-        )
+        _render_cv_tab(artifacts)
 
-        st.markdown("---")
-        st.markdown("""
-        **What's included in the generated CV:**
-        - Clean two-colour header with contact info
-        - Professional Summary auto-generated from your skills
-        - Skills section (up to 16 keywords)
-        - Experience & Education pulled from your upload
-        - Consistent typography optimised for ATS parsers
-        """)
-
-    # ═══════════════════════════════════════════
-    # TAB 3 — PORTFOLIO
-    # ═══════════════════════════════════════════
     with t_port:
-        with st.spinner("Building your portfolio…"):
-            port_zip = generate_portfolio(cv_data)
-
-        st.markdown("""
-        <div class="dl-strip">
-          <div class="dl-icon">🌐</div>
-          <div class="dl-text">
-            <strong>Portfolio Website Ready</strong><br/>
-            Single-file HTML + CSS. Deploy anywhere for free.
-          </div>
-        </div>""", unsafe_allow_html=True)
-        st.markdown("")
-        st.download_button(
-            "⬇️  Download Portfolio (ZIP)",
-            data=port_zip,
-            file_name="portfolio.zip",
-            mime="application/zip",
-            use_container_width=True,
-        )
+        _render_portfolio_tab(artifacts)
 
-        st.markdown("---")
-        st.markdown("""
-        **Sections included:** Hero · About · Skills Grid · Experience Timeline · Education · Contact
-
-        **Free deployment options:**
-        1. **GitHub Pages** — push `index.html` to a repo, enable Pages → live URL
-        2. **Netlify** — drag & drop the folder on netlify.app
-        3. **Vercel** — connect your GitHub repo in one click
-        4. **Cloudflare Pages** — drag & drop, instant global CDN
-        """)
-
-    # ═══════════════════════════════════════════
-    # TAB 4 — ROADMAP
-    # ═══════════════════════════════════════════
     if t_road and ats_results:
         with t_road:
-            missing = ats_results['missing_skills']
-            if missing:
-                with st.spinner("Building roadmap…"):
-                    roadmap_md = generate_skills_roadmap(missing)
-                st.markdown(roadmap_md)
-                st.markdown("---")
-                st.download_button(
-                    "⬇️  Download Roadmap (Markdown)",
-                    data=roadmap_md,
-                    file_name="skills_roadmap.md",
-                    mime="text/markdown",
-                )
-            else:
-                st.success("🎉 Your skills are a strong match — no gaps detected!")
+            _render_roadmap_tab(ats_results, artifacts)
 
-    # ═══════════════════════════════════════════
-    # TAB 5 — PARSED DATA
-    # ═══════════════════════════════════════════
     with t_data:
-        c1, c2 = st.columns(2)
-        with c1:
-            st.markdown("#### 👤 Profile")
-            st.write(f"**Name:** {cv_data.get('name','—')}")
-            st.write(f"**Email:** {cv_data.get('email','—')}")
-            st.write(f"**Phone:** {cv_data.get('phone','—')}")
-        with c2:
-            st.markdown("#### 📊 Counts")
-            st.metric("Skills", len(cv_data.get('skills', [])))
-            st.metric("Experience entries", len(cv_data.get('experience', [])))
-            st.metric("Education entries", len(cv_data.get('education', [])))
-
-        st.markdown("---")
-
-        # skills
-        if cv_data.get('skills'):
-            st.markdown("#### 💼 Detected Skills")
-            cols = st.columns(5)
-            for i, s in enumerate(cv_data['skills']):
-                cols[i % 5].markdown(f"✓ {s}")
-
-        st.markdown("---")
-
-        # experience
-        if cv_data.get('experience'):
-            st.markdown("#### 🏢 Experience")
-            for exp in cv_data['experience']:
-                with st.expander(exp.get('title', 'Entry'), expanded=False):
-                    st.write(exp.get('description', 'No additional detail.'))
-
-        st.markdown("---")
-
-        # education
-        if cv_data.get('education'):
-            st.markdown("#### 🎓 Education")
-            for e in cv_data['education']:
-                st.write(f"• {e}")
+        _render_data_tab(cv_data)
 
 
 if __name__ == "__main__":